@@ -9,6 +9,8 @@ class ToolConfig(BaseSettings):
     # Caching settings
     enable_caching: bool = True
     cache_ttl_seconds: int = 3600  # 1 hour default
+    fit_cache_dir: str = "~/.cache/apex/fit"  # raw FIT downloads; empty disables
+    fit_cache_max_mb: int = 512
 
     # Query limits
     default_activity_limit: int = 20
@@ -1,24 +1,54 @@
 """Response builder for structured Garmin Connect MCP responses."""
 
 import json
-from datetime import UTC, datetime
-from typing import Any, cast
+import math
+from datetime import UTC, date, datetime
+from typing import Any
 
 from .pagination import PaginationInfo
 from .types import JSONSerializable, UnitSystem
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
 
 def _convert_datetimes(obj: Any) -> Any:  # type: ignore[misc]
-    """Recursively convert datetime objects to ISO strings."""
-    if isinstance(obj, datetime):
+    """Recursively convert date/datetime objects to ISO strings.
+
+    Non-finite floats become None, as orjson writes them, since NaN and
+    Infinity are not valid JSON.
+    """
+    if isinstance(obj, date):
         return obj.isoformat()
+    elif isinstance(obj, float) and not math.isfinite(obj):
+        return None
     elif isinstance(obj, dict):
         return {str(k): _convert_datetimes(v) for k, v in obj.items()}  # type: ignore[misc]
-    elif isinstance(obj, list):
+    elif isinstance(obj, list | tuple):
         return [_convert_datetimes(item) for item in obj]  # type: ignore[misc]
     return obj
 
 
+def _dumps(obj: Any) -> str:
+    """Serialize to compact JSON, converting datetime objects to ISO strings.
+
+    Uses orjson when installed; it encodes datetimes natively, so the payload
+    is not walked beforehand. Falls back to the stdlib encoder otherwise, or
+    for values orjson rejects (e.g. integers wider than 64 bits). The fallback
+    keeps non-ASCII characters unescaped and writes NaN/Infinity as null like
+    orjson; the two paths are semantically equivalent, though float exponents
+    are spelled differently (1e+20 vs 1e20).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(_convert_datetimes(obj), separators=(",", ":"), ensure_ascii=False)
+
+
 class ResponseBuilder:
     """Build structured responses with data, analysis, and metadata."""
 
@@ -78,28 +108,22 @@ class ResponseBuilder:
         Returns:
             JSON string with structured response
         """
-        # Convert datetime objects to ISO strings
-        converted_data = cast(JSONSerializable, _convert_datetimes(data))
-        converted_analysis: dict[str, Any] | None = None
-        if analysis:
-            converted_analysis = cast(dict[str, Any], _convert_datetimes(analysis))
+        response: dict[str, Any] = {"data": data}
 
-        response: dict[str, Any] = {"data": converted_data}
-
-        if converted_analysis:
-            response["analysis"] = converted_analysis
+        if analysis:
+            response["analysis"] = analysis
 
         if pagination:
             response["pagination"] = pagination
 
-        # Build metadata with timestamp
-        meta = metadata or {}
-        converted_meta = cast(dict[str, Any], _convert_datetimes(meta))
-        converted_meta["fetched_at"] = datetime.now(UTC).isoformat().replace("+00:00", "Z")
+        # Build metadata with timestamp (copied so the caller's dict is untouched)
+        meta = dict(metadata or {})
+        meta["fetched_at"] = datetime.now(UTC).isoformat().replace("+00:00", "Z")
 
-        response["metadata"] = converted_meta
+        response["metadata"] = meta
 
-        return json.dumps(response, separators=(",", ":"))
+        # Datetime objects are converted to ISO strings during serialization
+        return _dumps(response)
 
     @staticmethod
     def build_error_response(
@@ -127,7 +151,7 @@ class ResponseBuilder:
         if suggestions:
             response["error"]["suggestions"] = suggestions
 
-        return json.dumps(response, separators=(",", ":"))
+        return _dumps(response)
 
     @staticmethod
     def format_activity(
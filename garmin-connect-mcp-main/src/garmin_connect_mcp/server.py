@@ -48,7 +48,7 @@ from .tools.user_profile import get_user_profile
 from .tools.weight import manage_weight_data, query_weight_data
 from .tools.womens_health import query_womens_health
 from .tools.workouts import manage_workouts
-from .tools.raw_data import get_activity_fit_stream
+from .tools.raw_data import get_activity_fit_stream, get_activity_fit_streams
 
 # Register activity tools
 mcp.tool(
@@ -75,6 +75,12 @@ mcp.tool(
         "openWorldHint": False,
     }
 )(get_activity_fit_stream)
+mcp.tool(
+    annotations={
+        "readOnlyHint": True,
+        "openWorldHint": False,
+    }
+)(get_activity_fit_streams)
 
 # Register analysis tools
 mcp.tool(
@@ -1,69 +1,492 @@
 
+import asyncio
+import contextlib
+import functools
 import io
+import mmap
+import multiprocessing
+import os
+import shutil
+import struct
+import sys
+import tempfile
 import zipfile
-import fitparse
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated, Any, BinaryIO
+
+import fitdecode
 from garminconnect import Garmin
 
 from ..auth import load_config
 from ..client import init_garmin_client, GarminClientWrapper
+from ..config import get_tool_config
 from ..response_builder import ResponseBuilder
 
+# Record fields of interest for high-fidelity streams
+STREAM_FIELDS = ("timestamp", "heart_rate", "cadence", "speed", "distance")
+# Interned so membership tests against fitdecode's profile names (themselves
+# interned literals) usually short-circuit on identity before comparing characters
+_WANTED_FIELDS = frozenset(sys.intern(name) for name in STREAM_FIELDS)
+
+# Upper bound of the read buffer used when streaming the FIT entry out of the ZIP
+FIT_READ_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Downloads larger than this are unzipped from a temporary file instead of memory
+ZIP_SPOOL_MAX_SIZE = 2 << 20  # 2 MiB
+
+# ZIP local file header: fixed part size and signature
+_ZIP_LOCAL_HEADER_SIZE = 30
+_ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+# Batch mode: activities per call, and concurrent downloads feeding the parse pool
+FIT_BATCH_MAX_ACTIVITIES = 20
+FIT_DOWNLOAD_CONCURRENCY = 4
+
+# Parse workers, created on the first batch call and kept for the process lifetime
+_parse_pool: ProcessPoolExecutor | None = None
+
+# Garmin client shared by all calls, created on the first cache miss
+_client_lock = asyncio.Lock()
+_client_wrapper: GarminClientWrapper | None = None
+
+class _StreamFieldsProcessor(fitdecode.DefaultDataProcessor):
+    """Data processor that only post-processes the stream fields.
+
+    The default processor resolves up to three hook methods for every field of
+    every data message. We discard all but a handful of record fields, so the
+    hooks are skipped for everything else; the kept fields still get the
+    default conversions (e.g. timestamps to timezone-aware datetimes).
+    """
+
+    def on_process_type(self, reader, field_data):
+        if field_data.name in _WANTED_FIELDS:
+            super().on_process_type(reader, field_data)
+
+    def on_process_field(self, reader, field_data):
+        pass
+
+    def on_process_unit(self, reader, field_data):
+        pass
+
+    def on_process_message(self, reader, data_message):
+        pass
+
+
+def _parse_fit_records(stream: BinaryIO | mmap.mmap | bytes) -> dict[str, list[Any]]:
+    """
+    Decode the 'record' messages of a FIT file into columnar streams.
+
+    Only data frames named 'record' are inspected; definition, header and CRC
+    frames as well as every other message type are skipped, and field
+    post-processing is limited to STREAM_FIELDS. CRC verification is disabled
+    since the file comes straight from Garmin over TLS and checking it costs an
+    extra pass over the buffer.
+
+    Args:
+        stream: Binary file-like object, mmap or raw bytes holding the FIT payload.
+
+    Returns:
+        Dict mapping each of STREAM_FIELDS to a list of values, one per record
+        (None where the record lacks the field). Records without any of the
+        fields are dropped.
+    """
+    reader = fitdecode.FitReader(
+        stream,
+        check_crc=fitdecode.CrcCheck.DISABLED,
+        processor=_StreamFieldsProcessor(),
+    )
+
+    ts: list[datetime | None] = []
+    hr: list[int | None] = []
+    cad: list[int | None] = []
+    spd: list[float | None] = []
+    dist: list[float | None] = []
+
+    # Bound once: the loop below runs once per second of activity
+    ts_append = ts.append
+    hr_append = hr.append
+    cad_append = cad.append
+    spd_append = spd.append
+    dist_append = dist.append
+
+    with reader:
+        for frame in reader:
+            if not isinstance(frame, fitdecode.FitDataMessage) or frame.name != "record":
+                continue
+
+            # One pass over the record's fields, keeping only the wanted ones; the
+            # dict is only allocated once a wanted field shows up
+            fields = None
+            for field in frame.fields:
+                name = field.name
+                if name in _WANTED_FIELDS:
+                    if fields is None:
+                        fields = {}
+                    fields[name] = field.value
+            if fields is None:
+                continue
+
+            # Timestamps stay datetimes; ResponseBuilder serializes them as ISO strings
+            ts_append(fields.get("timestamp"))
+            hr_append(fields.get("heart_rate"))
+            cad_append(fields.get("cadence"))
+            spd_append(fields.get("speed"))
+            dist_append(fields.get("distance"))
+
+    return {"timestamp": ts, "heart_rate": hr, "cadence": cad, "speed": spd, "distance": dist}
+
+
+def _fit_cache_path(activity_id: int) -> Path | None:
+    """Return the on-disk cache path for an activity's FIT file, or None if caching is off."""
+    config = get_tool_config()
+    if not config.enable_caching or not config.fit_cache_dir:
+        return None
+    return Path(config.fit_cache_dir).expanduser() / f"{int(activity_id)}.fit"
+
+
+def _prune_fit_cache(cache_dir: Path, max_bytes: int) -> None:
+    """Delete the least recently used FIT files until the cache fits in max_bytes."""
+    entries = []
+    for path in cache_dir.glob("*.fit"):
+        with contextlib.suppress(OSError):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        with contextlib.suppress(OSError):
+            path.unlink()
+        total -= size
+
+
+def _store_fit_in_cache(stream: BinaryIO | mmap.mmap, cache_path: Path) -> bool:
+    """
+    Copy a FIT payload into the cache atomically (temp file + rename).
+
+    The temp file is removed whenever the copy does not make it into place,
+    including when reading the stream fails (e.g. a corrupt archive entry);
+    the LRU sweep only looks at *.fit files and would never reclaim it.
+
+    Returns:
+        True if the file was stored, False if the cache is not writable
+    """
+    tmp_name = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cache_path.parent, suffix=".tmp", delete=False) as tmp:
+            tmp_name = tmp.name
+            shutil.copyfileobj(stream, tmp, FIT_READ_BUFFER_SIZE)
+        os.replace(tmp_name, cache_path)
+        tmp_name = None
+    except OSError:
+        return False
+    finally:
+        if tmp_name is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+
+    _prune_fit_cache(cache_path.parent, get_tool_config().fit_cache_max_mb * (1 << 20))
+    return True
+
+
+def _read_cached_fit(cache_path: Path) -> dict[str, list[Any]] | None:
+    """
+    Parse a cached FIT file; returns None (and drops the file) if it is missing or unreadable.
+
+    Any decode failure counts as unreadable: on corrupt input fitdecode raises
+    TypeError, ValueError, struct.error and friends besides FitError, and a bad
+    file left in place would fail every later call instead of being downloaded
+    again.
+    """
+    try:
+        with open(cache_path, "rb", buffering=FIT_READ_BUFFER_SIZE) as fp:
+            streams = _parse_fit_records(fp)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        with contextlib.suppress(OSError):
+            cache_path.unlink()
+        return None
+
+    # Refresh the mtime so the LRU sweep keeps recently used files
+    with contextlib.suppress(OSError):
+        os.utime(cache_path)
+    return streams
+
+
+@contextlib.contextmanager
+def _open_fit_entry(
+    z: zipfile.ZipFile, fit_info: zipfile.ZipInfo, spool: BinaryIO, spool_on_disk: bool
+) -> Iterator[BinaryIO | mmap.mmap]:
+    """
+    Open the FIT entry of a downloaded archive for reading.
+
+    Uncompressed (ZIP_STORED) entries of an archive that was written to disk
+    are memory-mapped in place, which skips ZipExtFile's read and CRC pass and
+    the copies that come with it. Everything else is read through a buffered
+    ZipExtFile.
+
+    Args:
+        z: The open archive.
+        fit_info: The FIT entry.
+        spool: The file object backing the archive.
+        spool_on_disk: Whether the spool is a real file (large archives).
+    """
+    if fit_info.compress_type == zipfile.ZIP_STORED and spool_on_disk and fit_info.file_size > 0:
+        # The entry's data follows its local header, whose variable-length part
+        # can differ from the central directory record
+        spool.seek(fit_info.header_offset)
+        header = spool.read(_ZIP_LOCAL_HEADER_SIZE)
+        if len(header) == _ZIP_LOCAL_HEADER_SIZE and header[:4] == _ZIP_LOCAL_HEADER_SIGNATURE:
+            name_len, extra_len = struct.unpack("<HH", header[26:30])
+            data_offset = fit_info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_len + extra_len
+            aligned_offset = data_offset - data_offset % mmap.ALLOCATIONGRANULARITY
+            with mmap.mmap(
+                spool.fileno(),
+                length=data_offset - aligned_offset + fit_info.file_size,
+                offset=aligned_offset,
+                access=mmap.ACCESS_READ,
+            ) as mm:
+                mm.seek(data_offset - aligned_offset)
+                yield mm
+            return
+
+    # The buffer keeps the decoder's many small reads from hitting ZipExtFile one by one
+    buffer_size = max(1, min(fit_info.file_size, FIT_READ_BUFFER_SIZE))
+    with z.open(fit_info) as fp:
+        yield io.BufferedReader(fp, buffer_size=buffer_size)
+
+
+def _parse_fit_download(zip_bytes: bytes, cache_path: Path | None = None) -> dict[str, list[Any]] | None:
+    """
+    Extract and parse the FIT file from a Garmin 'original' download.
+
+    Args:
+        zip_bytes: The downloaded ZIP archive.
+        cache_path: Where to keep the extracted FIT file, if caching is enabled.
+
+    Returns:
+        Columnar streams (see _parse_fit_records), or None if the archive holds no FIT file.
+    """
+    # The caller holds the downloaded bytes until we return, so the aim is to
+    # avoid a second in-memory copy: small archives are read in place (BytesIO
+    # shares the bytes' buffer), large ones go straight to a temporary file,
+    # which also lets stored entries be memory-mapped
+    spool: BinaryIO
+    spool_on_disk = len(zip_bytes) > ZIP_SPOOL_MAX_SIZE
+    if spool_on_disk:
+        spool = tempfile.TemporaryFile()
+        spool.write(zip_bytes)
+        spool.seek(0)
+    else:
+        spool = io.BytesIO(zip_bytes)
+
+    # Unzip
+    with spool, zipfile.ZipFile(spool) as z:
+        # Look for .fit file (original downloads hold a single one)
+        fit_info = next((zi for zi in z.infolist() if zi.filename.lower().endswith('.fit')), None)
+        if fit_info is None:
+            return None
+
+        # Keep the extracted file so later calls skip the download entirely
+        if cache_path is not None:
+            with _open_fit_entry(z, fit_info, spool, spool_on_disk) as fp:
+                stored = _store_fit_in_cache(fp, cache_path)
+            if stored:
+                streams = _read_cached_fit(cache_path)
+                if streams is not None:
+                    return streams
+
+        # Parse FIT straight from the archive entry
+        with _open_fit_entry(z, fit_info, spool, spool_on_disk) as fp:
+            return _parse_fit_records(fp)
+
+
+async def _get_wrapper() -> GarminClientWrapper | None:
+    """
+    Return the shared Garmin client, logging in on first use.
+
+    Bursts of tool calls would otherwise each reload the config and tokens
+    (and possibly refresh them). A failed login is not cached, so the next
+    call tries again.
+    """
+    global _client_wrapper
+    async with _client_lock:
+        if _client_wrapper is None:
+            client = init_garmin_client(load_config())
+            if client:
+                _client_wrapper = GarminClientWrapper(client)
+        return _client_wrapper
+
+
+def reset_client() -> None:
+    """Drop the shared Garmin client (e.g. after re-authenticating, or between tests)."""
+    global _client_lock, _client_wrapper
+    _client_lock = asyncio.Lock()
+    _client_wrapper = None
+
+
 async def get_activity_fit_stream(activity_id: int) -> str:
     """
     Download and parse raw FIT file to extract high-fidelity streams.
-    
-    Crucial for 'Cadence Lock' detection (FR-K2) as it preserves raw data 
-    without API smoothing.
-    
+
+    Crucial for 'Cadence Lock' detection (FR-K2) as it preserves raw data
+    without API smoothing. FIT files are immutable once uploaded, so they are
+    kept in an on-disk cache (see ToolConfig.fit_cache_dir) and repeated
+    calls for the same activity skip the download.
+
     Args:
         activity_id: The Garmin Activity ID.
-        
+
     Returns:
-        JSON string containing list of records with [timestamp, heart_rate, cadence, speed].
+        JSON string containing columnar streams (timestamp, heart_rate, cadence,
+        speed, distance), each a list with one value per record.
     """
     try:
-        config = load_config()
-        client = init_garmin_client(config)
-        if not client:
-             return ResponseBuilder.build_error_response("Failed to initialize Garmin client")
-             
-        wrapper = GarminClientWrapper(client)
-
-        # Download original file (comes as ZIP)
-        zip_bytes = wrapper.safe_call("download_activity", activity_id, dl_fmt=Garmin.ActivityDownloadFormat.ORIGINAL)
-        
-        # Unzip
-        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as z:
-            # Look for .fit file
-            fit_files = [f for f in z.namelist() if f.lower().endswith('.fit')]
-            if not fit_files:
+        cache_path = _fit_cache_path(activity_id)
+        streams = _read_cached_fit(cache_path) if cache_path is not None else None
+        cache_hit = streams is not None
+
+        if streams is None:
+            wrapper = await _get_wrapper()
+            if wrapper is None:
+                 return ResponseBuilder.build_error_response("Failed to initialize Garmin client")
+
+            # Download original file (comes as ZIP)
+            streams = _parse_fit_download(
+                wrapper.safe_call("download_activity", activity_id, dl_fmt=Garmin.ActivityDownloadFormat.ORIGINAL),
+                cache_path,
+            )
+            if streams is None:
                 return ResponseBuilder.build_error_response("No FIT file found in download")
-            
-            fit_content = z.read(fit_files[0])
-            
-        # Parse FIT
-        fitfile = fitparse.FitFile(io.BytesIO(fit_content))
-        
-        records = []
-        for record in fitfile.get_messages("record"):
-            point = {}
-            # metrics of interest
-            for data in record:
-                if data.name in ['timestamp', 'heart_rate', 'cadence', 'speed', 'distance']:
-                    # Handle timestamp to string if needed, or keep as object if json serializer handles it
-                    # Usually better to isoformat
-                    if data.name == 'timestamp' and hasattr(data.value, 'isoformat'):
-                        point[data.name] = data.value.isoformat()
-                    else:
-                        point[data.name] = data.value
-            
-            if point: # Only add non-empty
-                records.append(point)
-                
+
         return ResponseBuilder.build_response(
-            data={"stream": records, "count": len(records)},
-            metadata={"source": "raw_fit_parse", "activity_id": activity_id}
+            data={"stream": streams, "count": len(streams["timestamp"])},
+            metadata={"source": "raw_fit_parse", "activity_id": activity_id, "cache_hit": cache_hit}
         )
 
     except Exception as e:
         return ResponseBuilder.build_error_response(f"Failed to process FIT file: {str(e)}")
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """
+    Return the process pool that runs FIT parsing for batch calls.
+
+    Workers are started from a forkserver (spawn where that is unavailable)
+    rather than forked: the pool grows while download threads hold locks, and
+    a forked child would inherit those locks held.
+    """
+    global _parse_pool
+    if _parse_pool is None:
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=max(2, (os.cpu_count() or 2) // 2),
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _parse_pool
+
+
+def _discard_parse_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken parse pool so the next _get_parse_pool() call builds a fresh one."""
+    global _parse_pool
+    if _parse_pool is pool:
+        _parse_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def get_activity_fit_streams(
+    activity_ids: Annotated[list[int], "Garmin Activity IDs (at most 20)"],
+) -> str:
+    """
+    Download and parse the raw FIT files of several activities at once.
+
+    Batch form of get_activity_fit_stream. FIT decoding is CPU bound, so the
+    files are parsed in a pool of worker processes while the remaining
+    downloads are still in flight; wall time tends towards the slower of the
+    network and the parse instead of their sum.
+
+    Args:
+        activity_ids: The Garmin Activity IDs.
+
+    Returns:
+        JSON string with one entry per parsed activity (activity_id, stream,
+        count) and the activities that failed with their error messages.
+    """
+    ids = list(dict.fromkeys(activity_ids))
+    if not ids or len(ids) > FIT_BATCH_MAX_ACTIVITIES:
+        return ResponseBuilder.build_error_response(
+            f"Invalid number of activities: {len(ids)}. Must be between 1 and {FIT_BATCH_MAX_ACTIVITIES}.",
+            error_type="validation_error",
+        )
+
+    try:
+        loop = asyncio.get_running_loop()
+        pool = _get_parse_pool()
+        download_slots = asyncio.Semaphore(FIT_DOWNLOAD_CONCURRENCY)
+
+        async def fetch_streams(activity_id: int) -> tuple[dict[str, list[Any]], bool]:
+            cache_path = _fit_cache_path(activity_id)
+            if cache_path is not None and cache_path.is_file():
+                streams = await loop.run_in_executor(pool, _read_cached_fit, cache_path)
+                if streams is not None:
+                    return streams, True
+
+            # Downloads run in threads; the ZIP bytes are handed to a parse worker
+            # as soon as they arrive, freeing the slot for the next download
+            client = await _get_wrapper()
+            if client is None:
+                raise RuntimeError("Failed to initialize Garmin client")
+            async with download_slots:
+                zip_bytes = await loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        client.safe_call,
+                        "download_activity",
+                        activity_id,
+                        dl_fmt=Garmin.ActivityDownloadFormat.ORIGINAL,
+                    ),
+                )
+            streams = await loop.run_in_executor(pool, _parse_fit_download, zip_bytes, cache_path)
+            if streams is None:
+                raise ValueError("No FIT file found in download")
+            return streams, False
+
+        results = await asyncio.gather(*(fetch_streams(i) for i in ids), return_exceptions=True)
+
+        # A dead worker (OOM kill, segfault) breaks the whole executor; replace it
+        # and retry the affected activities once instead of failing every later batch
+        broken = [i for i, r in zip(ids, results, strict=True) if isinstance(r, BrokenProcessPool)]
+        if broken:
+            _discard_parse_pool(pool)
+            pool = _get_parse_pool()
+            retried = await asyncio.gather(*(fetch_streams(i) for i in broken), return_exceptions=True)
+            by_id = dict(zip(ids, results, strict=True)) | dict(zip(broken, retried, strict=True))
+            results = [by_id[i] for i in ids]
+
+        activities = []
+        errors = []
+        cache_hits = 0
+        for activity_id, result in zip(ids, results, strict=True):
+            if isinstance(result, BaseException):
+                errors.append({"activity_id": activity_id, "error": f"Failed to process FIT file: {str(result)}"})
+                continue
+            streams, cache_hit = result
+            cache_hits += cache_hit
+            activities.append(
+                {"activity_id": activity_id, "stream": streams, "count": len(streams["timestamp"])}
+            )
+
+        return ResponseBuilder.build_response(
+            data={"activities": activities, "errors": errors},
+            metadata={"source": "raw_fit_parse", "activity_ids": ids, "cache_hits": cache_hits},
+        )
+
+    except Exception as e:
+        return ResponseBuilder.build_error_response(f"Failed to process FIT files: {str(e)}")
@@ -0,0 +1,371 @@
+"""Tests for raw FIT stream parsing."""
+
+import io
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zipfile
+from datetime import UTC, datetime
+
+import pytest
+
+from garmin_connect_mcp.tools.raw_data import (
+    FIT_READ_BUFFER_SIZE,
+    _open_fit_entry,
+    _parse_fit_download,
+    _parse_fit_records,
+    _prune_fit_cache,
+    _read_cached_fit,
+    _store_fit_in_cache,
+    get_activity_fit_stream,
+    get_activity_fit_streams,
+    reset_client,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_client():
+    """Keep the shared Garmin client from leaking between tests."""
+    reset_client()
+    yield
+    reset_client()
+
+
+# Seconds between the Unix epoch and the FIT epoch (1989-12-31T00:00:00Z)
+FIT_EPOCH_OFFSET = 631065600
+
+
+def _fit_crc(data: bytes) -> int:
+    """Compute the FIT CRC-16 of a byte string."""
+    table = (
+        0x0000, 0xCC01, 0xD801, 0x1400, 0xF001, 0x3C00, 0x2800, 0xE401,
+        0xA001, 0x6C00, 0x7800, 0xB401, 0x5000, 0x9C01, 0x8801, 0x4400,
+    )  # fmt: skip
+    crc = 0
+    for byte in data:
+        crc = (crc >> 4) ^ table[crc & 0xF] ^ table[byte & 0xF]
+        crc = (crc >> 4) ^ table[crc & 0xF] ^ table[(byte >> 4) & 0xF]
+    return crc
+
+
+def _build_fit(records: list[tuple[int, int, int, int, int]]) -> bytes:
+    """Build a minimal FIT file with an event message and 'record' messages.
+
+    Each record tuple is (unix_ts, heart_rate, cadence, speed_mm_s, distance_cm).
+    """
+    body = b""
+
+    # Definition for local type 1: event (global 21) with a single event field
+    body += struct.pack("<BBBHB", 0x41, 0, 0, 21, 1) + struct.pack("<BBB", 0, 1, 0x00)
+    body += struct.pack("<BB", 0x01, 0)
+
+    # Definition for local type 0: record (global 20)
+    fields = (
+        (253, 4, 0x86),  # timestamp
+        (3, 1, 0x02),  # heart_rate
+        (4, 1, 0x02),  # cadence
+        (6, 2, 0x84),  # speed (m/s, scale 1000)
+        (5, 4, 0x86),  # distance (m, scale 100)
+    )
+    body += struct.pack("<BBBHB", 0x40, 0, 0, 20, len(fields))
+    for num, size, base_type in fields:
+        body += struct.pack("<BBB", num, size, base_type)
+
+    for unix_ts, hr, cadence, speed, distance in records:
+        body += struct.pack(
+            "<BIBBHI", 0x00, unix_ts - FIT_EPOCH_OFFSET, hr, cadence, speed, distance
+        )
+
+    header = struct.pack("<BBHI4sH", 14, 0x10, 2093, len(body), b".FIT", 0)
+    data = header + body
+    return data + struct.pack("<H", _fit_crc(data))
+
+
+def _build_zip(
+    fit: bytes, name: str = "123_ACTIVITY.fit", compression: int = zipfile.ZIP_DEFLATED
+) -> bytes:
+    """Wrap a FIT payload the way Garmin's 'original' download does."""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", compression) as z:
+        z.writestr(name, fit)
+    return archive.getvalue()
+
+
+def test_parse_fit_records_extracts_stream_fields():
+    """Test that record messages are decoded into columnar streams."""
+    ts = int(datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC).timestamp())
+    fit = _build_fit([(ts, 140, 88, 3250, 1000), (ts + 1, 142, 89, 3300, 1330)])
+
+    streams = _parse_fit_records(io.BytesIO(fit))
+
+    assert streams == {
+        "timestamp": [
+            datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC),
+            datetime(2025, 10, 15, 7, 0, 1, tzinfo=UTC),
+        ],
+        "heart_rate": [140, 142],
+        "cadence": [88, 89],
+        "speed": [3.25, 3.3],
+        "distance": [10.0, 13.3],
+    }
+
+
+def test_parse_fit_records_accepts_bytes():
+    """Test that raw bytes are accepted as well as file-like objects."""
+    ts = int(datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC).timestamp())
+    streams = _parse_fit_records(_build_fit([(ts, 150, 90, 3000, 500)]))
+
+    assert streams["heart_rate"] == [150]
+
+
+def test_parse_fit_records_empty_file():
+    """Test that a FIT file without record messages yields empty streams."""
+    streams = _parse_fit_records(io.BytesIO(_build_fit([])))
+
+    assert set(streams) == {"timestamp", "heart_rate", "cadence", "speed", "distance"}
+    assert all(column == [] for column in streams.values())
+
+
+def test_parse_fit_records_from_zip_entry():
+    """Test parsing directly from a streamed ZIP entry."""
+    ts = int(datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC).timestamp())
+    archive = _build_zip(_build_fit([(ts + i, 140, 88, 3250, i) for i in range(300)]))
+
+    with zipfile.ZipFile(io.BytesIO(archive)) as z, z.open("123_ACTIVITY.fit") as fp:
+        streams = _parse_fit_records(io.BufferedReader(fp, buffer_size=FIT_READ_BUFFER_SIZE))
+
+    assert len(streams["timestamp"]) == 300
+    assert streams["distance"][-1] == 2.99
+
+
+def test_parse_fit_download_without_cache():
+    """Test extracting and parsing a downloaded archive."""
+    ts = int(datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC).timestamp())
+    streams = _parse_fit_download(_build_zip(_build_fit([(ts, 140, 88, 3250, 1000)])))
+
+    assert streams is not None
+    assert streams["heart_rate"] == [140]
+
+
+def test_parse_fit_download_without_fit_file():
+    """Test that an archive without a .fit entry yields None."""
+    assert _parse_fit_download(_build_zip(b"not a fit file", name="readme.txt")) is None
+
+
+def test_parse_fit_download_populates_cache(tmp_path):
+    """Test that the extracted FIT file is cached and served on the next read."""
+    ts = int(datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC).timestamp())
+    fit = _build_fit([(ts, 140, 88, 3250, 1000), (ts + 1, 141, 88, 3250, 1300)])
+    cache_path = tmp_path / "42.fit"
+
+    streams = _parse_fit_download(_build_zip(fit), cache_path)
+
+    assert cache_path.read_bytes() == fit
+    assert _read_cached_fit(cache_path) == streams
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_read_cached_fit_drops_corrupt_file(tmp_path):
+    """Test that an unreadable cache entry is removed and reported as a miss."""
+    cache_path = tmp_path / "42.fit"
+    cache_path.write_bytes(b"garbage")
+
+    assert _read_cached_fit(cache_path) is None
+    assert not cache_path.exists()
+    assert _read_cached_fit(cache_path) is None
+
+
+async def test_get_activity_fit_stream_redownloads_corrupt_cache_entry(monkeypatch, tmp_path):
+    """Test that a cached file failing to decode is dropped and downloaded again."""
+    from garmin_connect_mcp.tools import raw_data
+
+    ts = int(datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC).timestamp())
+    fit = _build_fit([(ts + i, 150, 90, 3000, i) for i in range(10)])
+    # A zero-sized timestamp field makes fitdecode raise ValueError, not FitError
+    corrupt = bytearray(fit)
+    corrupt[fit.index(bytes((253, 4, 0x86))) + 1] = 0
+    cache_path = tmp_path / "7.fit"
+    cache_path.write_bytes(corrupt)
+    downloads = []
+
+    class FakeGarmin:
+        def download_activity(self, activity_id, dl_fmt):
+            downloads.append(activity_id)
+            return _build_zip(fit)
+
+    monkeypatch.setattr(
+        raw_data, "_fit_cache_path", lambda activity_id: tmp_path / f"{activity_id}.fit"
+    )
+    monkeypatch.setattr(raw_data, "load_config", lambda: None)
+    monkeypatch.setattr(raw_data, "init_garmin_client", lambda config: FakeGarmin())
+
+    response = json.loads(await get_activity_fit_stream(7))
+
+    assert downloads == [7]
+    assert response["data"]["count"] == 10
+    assert response["metadata"]["cache_hit"] is False
+    assert cache_path.read_bytes() == fit
+
+
+def test_store_fit_in_cache_removes_temp_file_on_read_error(tmp_path):
+    """Test that a stream failing mid-copy leaves no temp file behind."""
+
+    class _CorruptEntry(io.RawIOBase):
+        def readable(self):
+            return True
+
+        def readinto(self, b):
+            raise zipfile.BadZipFile("Bad CRC-32")
+
+    cache_path = tmp_path / "42.fit"
+
+    with pytest.raises(zipfile.BadZipFile):
+        _store_fit_in_cache(_CorruptEntry(), cache_path)
+
+    assert not cache_path.exists()
+    assert not list(tmp_path.iterdir())
+
+
+def test_prune_fit_cache_removes_least_recently_used(tmp_path):
+    """Test that the LRU sweep deletes the oldest files first."""
+    for i in range(3):
+        path = tmp_path / f"{i}.fit"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))
+
+    _prune_fit_cache(tmp_path, max_bytes=200)
+
+    assert sorted(p.name for p in tmp_path.glob("*.fit")) == ["1.fit", "2.fit"]
+
+
+def test_open_fit_entry_maps_stored_entry_in_place():
+    """Test that an uncompressed entry of an on-disk archive is memory-mapped."""
+    ts = int(datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC).timestamp())
+    fit = _build_fit([(ts + i, 140, 88, 3250, i) for i in range(50)])
+    archive = _build_zip(fit, name="a" * 37 + ".fit", compression=zipfile.ZIP_STORED)
+
+    with tempfile.TemporaryFile() as spool:
+        spool.write(archive)
+        spool.seek(0)
+        with zipfile.ZipFile(spool) as z:
+            fit_info = z.infolist()[0]
+            with _open_fit_entry(z, fit_info, spool, spool_on_disk=True) as fp:
+                assert isinstance(fp, mmap.mmap)
+                assert fp.read() == fit
+
+
+def test_parse_fit_download_stored_entry_spooled_to_disk(monkeypatch):
+    """Test parsing an uncompressed entry of an archive unzipped from disk."""
+    from garmin_connect_mcp.tools import raw_data
+
+    monkeypatch.setattr(raw_data, "ZIP_SPOOL_MAX_SIZE", 64)
+    ts = int(datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC).timestamp())
+    fit = _build_fit([(ts + i, 140, 88, 3250, i) for i in range(50)])
+
+    streams = _parse_fit_download(_build_zip(fit, compression=zipfile.ZIP_STORED))
+
+    assert streams is not None
+    assert len(streams["timestamp"]) == 50
+    assert streams["distance"][-1] == 0.49
+
+
+async def test_get_activity_fit_streams_mixes_cache_hits_and_downloads(monkeypatch, tmp_path):
+    """Test that a batch serves cached files and downloads and parses the rest."""
+    from garmin_connect_mcp.tools import raw_data
+
+    ts = int(datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC).timestamp())
+    (tmp_path / "1.fit").write_bytes(_build_fit([(ts, 140, 88, 3250, 1000)]))
+    downloads = []
+
+    class FakeGarmin:
+        def download_activity(self, activity_id, dl_fmt):
+            downloads.append(activity_id)
+            if activity_id == 3:
+                return _build_zip(b"not a fit file", name="readme.txt")
+            return _build_zip(_build_fit([(ts + i, 150, 90, 3000, i) for i in range(10)]))
+
+    monkeypatch.setattr(
+        raw_data, "_fit_cache_path", lambda activity_id: tmp_path / f"{activity_id}.fit"
+    )
+    monkeypatch.setattr(raw_data, "load_config", lambda: None)
+    monkeypatch.setattr(raw_data, "init_garmin_client", lambda config: FakeGarmin())
+
+    response = json.loads(await get_activity_fit_streams([1, 2, 3, 2]))
+
+    assert sorted(downloads) == [2, 3]
+    assert [(a["activity_id"], a["count"]) for a in response["data"]["activities"]] == [
+        (1, 1),
+        (2, 10),
+    ]
+    assert [e["activity_id"] for e in response["data"]["errors"]] == [3]
+    assert response["metadata"]["cache_hits"] == 1
+    assert (tmp_path / "2.fit").is_file()
+
+
+async def test_get_activity_fit_streams_replaces_broken_pool(monkeypatch, tmp_path):
+    """Test that a batch hitting a dead parse worker rebuilds the pool and retries."""
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+
+    from garmin_connect_mcp.tools import raw_data
+
+    class BrokenPool:
+        shut_down = False
+
+        def submit(self, fn, *args):
+            future = Future()
+            future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+            return future
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut_down = True
+
+    ts = int(datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC).timestamp())
+
+    class FakeGarmin:
+        def download_activity(self, activity_id, dl_fmt):
+            return _build_zip(_build_fit([(ts + i, 150, 90, 3000, i) for i in range(5)]))
+
+    broken_pool = BrokenPool()
+    monkeypatch.setattr(raw_data, "_parse_pool", broken_pool)
+    monkeypatch.setattr(raw_data, "_fit_cache_path", lambda activity_id: None)
+    monkeypatch.setattr(raw_data, "load_config", lambda: None)
+    monkeypatch.setattr(raw_data, "init_garmin_client", lambda config: FakeGarmin())
+
+    response = json.loads(await get_activity_fit_streams([1, 2]))
+    fresh_pool = raw_data._parse_pool
+    fresh_pool.shutdown()
+
+    assert broken_pool.shut_down
+    assert fresh_pool is not broken_pool
+    assert [(a["activity_id"], a["count"]) for a in response["data"]["activities"]] == [
+        (1, 5),
+        (2, 5),
+    ]
+    assert response["data"]["errors"] == []
+
+
+async def test_get_activity_fit_streams_rejects_oversized_batch():
+    """Test that batches above the limit are rejected before any work starts."""
+    response = json.loads(await get_activity_fit_streams(list(range(1, 30))))
+
+    assert response["error"]["type"] == "validation_error"
+
+
+async def test_get_wrapper_reuses_client(monkeypatch):
+    """Test that the Garmin client is created once and shared across calls."""
+    from garmin_connect_mcp.tools import raw_data
+
+    logins = []
+    monkeypatch.setattr(raw_data, "load_config", lambda: None)
+    monkeypatch.setattr(
+        raw_data, "init_garmin_client", lambda config: logins.append(config) or object()
+    )
+
+    first = await raw_data._get_wrapper()
+    second = await raw_data._get_wrapper()
+
+    assert first is second
+    assert len(logins) == 1
@@ -1,7 +1,9 @@
 """Tests for ResponseBuilder."""
 
 import json
-from datetime import datetime
+from datetime import UTC, date, datetime
+
+from freezegun import freeze_time
 
 from garmin_connect_mcp.response_builder import ResponseBuilder
 
@@ -74,6 +76,42 @@ def test_build_response_with_datetime_conversion():
     assert "fetched_at" in parsed["metadata"]
 
 
+def test_build_response_stdlib_fallback_matches_orjson(monkeypatch):
+    """Test that the stdlib encoder produces the same JSON as orjson.
+
+    Floats with exponents are left out: the two spell them differently
+    (1e+20 vs 1e20) and only agree once parsed.
+    """
+    from garmin_connect_mcp import response_builder
+
+    data = {
+        "stream": {
+            "timestamp": [datetime(2025, 10, 15, 7, 0, 0, tzinfo=UTC), None],
+            "heart_rate": [140, None],
+            "speed": [3.25, float("nan"), float("inf")],
+        },
+        1: "non-string key",
+        "name": "Løpetur i Bøler – 5 km",
+        "day": date(2025, 10, 15),
+    }
+    metadata = {"activity_id": 42, "start": datetime(2025, 10, 15, 7, 0, 0)}
+
+    with freeze_time("2025-10-15 12:00:00"):
+        fast = ResponseBuilder.build_response(data, metadata=metadata)
+        monkeypatch.setattr(response_builder, "orjson", None)
+        slow = ResponseBuilder.build_response(data, metadata=metadata)
+
+    assert fast == slow
+    parsed = json.loads(slow)
+    assert parsed["data"]["stream"]["timestamp"] == ["2025-10-15T07:00:00+00:00", None]
+    assert parsed["data"]["1"] == "non-string key"
+    assert parsed["data"]["stream"]["speed"] == [3.25, None, None]
+    assert parsed["data"]["name"] == "Løpetur i Bøler – 5 km"
+    assert parsed["data"]["day"] == "2025-10-15"
+    assert parsed["metadata"]["start"] == "2025-10-15T07:00:00"
+    assert "fetched_at" not in metadata
+
+
 def test_format_activity_with_date_fields():
     """Test that format_activity uses format_date_with_day for date fields."""
     activity = {
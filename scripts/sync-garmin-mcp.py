@@ -8,11 +8,23 @@ Uses the same client initialization as the MCP server for:
 - OAuth token persistence (~/.garminconnect/)
 - Efficient get_activities_by_date() method
 - Proper error handling
+
+Usage:
+    sync-garmin-mcp.py <start_date> <end_date>   # one range, one JSON result
+    sync-garmin-mcp.py --server                  # JSON lines on stdin/stdout, one client for all ranges
+
+    --slim            keep only the details fields the Node side reads
+    --fields=a,b.c    keep only these dotted paths of each activity's details
 """
 
 import sys
 import json
+import asyncio
 import logging
+import random
+import sqlite3
+import threading
+import time
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -42,6 +54,32 @@ from garmin_connect_mcp.client import (
 from garmin_connect_mcp.auth import load_config
 
 
+# Duration fields in priority order, checked on the activity, then on its details
+DURATION_KEYS = ('duration', 'elapsedDuration', 'elapsedDurationInSeconds')
+# Duration fields checked last, on details.summaryDTO
+SUMMARY_DURATION_KEYS = ('elapsedDuration', 'duration')
+
+
+def probe_duration(obj: dict, key: str, label_prefix: str = '') -> tuple[int, str] | None:
+    """
+    Read a positive duration from obj[key].
+    
+    The value is normally a float number of seconds; a {'totalSeconds': ...}
+    object is accepted as well.
+    
+    Returns:
+        Tuple of (duration_seconds, source_used), or None if the field has no
+        positive number
+    """
+    value = obj.get(key)
+    if isinstance(value, dict):
+        value = value.get('totalSeconds')
+        key = key + '.totalSeconds'
+    if isinstance(value, (int, float)) and value > 0:
+        return (int(value), f'{label_prefix}{key}')
+    return None
+
+
 def extract_duration(activity: dict, details: dict | None = None) -> tuple[int, str]:
     """
     Extract duration from activity data.
@@ -52,6 +90,8 @@ def extract_duration(activity: dict, details: dict | None = None) -> tuple[int,
     - elapsedDurationInSeconds: float number (seconds) - alternative fallback
     
     The Garmin API consistently returns duration as a float number, not an object.
+    The same fields are then checked on the details object, followed by
+    details.summaryDTO.elapsedDuration and details.summaryDTO.duration.
     
     Args:
         activity: Activity data from list response (get_activities_by_date)
@@ -60,65 +100,358 @@ def extract_duration(activity: dict, details: dict | None = None) -> tuple[int,
     Returns:
         Tuple of (duration_seconds, source_used)
     """
-    # Priority 1: Check duration (direct float number from Garmin API)
-    # This is the most common case - Garmin returns duration as a float
-    duration = activity.get('duration')
-    if duration is not None:
-        # Handle both dict (unlikely but possible) and number (common case)
-        if isinstance(duration, dict):
-            total_seconds = duration.get('totalSeconds')
-            if total_seconds and isinstance(total_seconds, (int, float)) and total_seconds > 0:
-                return (int(total_seconds), "duration.totalSeconds")
-        elif isinstance(duration, (int, float)) and duration > 0:
-            return (int(duration), "duration")
-    
-    # Priority 2: Check elapsedDuration (also a float number)
-    elapsed = activity.get('elapsedDuration')
-    if elapsed is not None and isinstance(elapsed, (int, float)) and elapsed > 0:
-        return (int(elapsed), "elapsedDuration")
-    
-    # Priority 3: Check elapsedDurationInSeconds (alternative field name)
-    elapsed_sec = activity.get('elapsedDurationInSeconds')
-    if elapsed_sec is not None and isinstance(elapsed_sec, (int, float)) and elapsed_sec > 0:
-        return (int(elapsed_sec), "elapsedDurationInSeconds")
-    
-    # Priority 4: Fall back to details object if available
+    for key in DURATION_KEYS:
+        found = probe_duration(activity, key)
+        if found:
+            return found
+    
+    # Fall back to details object if available
     if details:
-        # Check details.duration (should also be a number, but handle dict case)
-        details_duration = details.get('duration')
-        if details_duration is not None:
-            if isinstance(details_duration, dict):
-                total_seconds = details_duration.get('totalSeconds')
-                if total_seconds and isinstance(total_seconds, (int, float)) and total_seconds > 0:
-                    return (int(total_seconds), "details.duration.totalSeconds")
-            elif isinstance(details_duration, (int, float)) and details_duration > 0:
-                return (int(details_duration), "details.duration")
-        
-        # Check details.elapsedDuration
-        details_elapsed = details.get('elapsedDuration')
-        if details_elapsed is not None and isinstance(details_elapsed, (int, float)) and details_elapsed > 0:
-            return (int(details_elapsed), "details.elapsedDuration")
-        
-        # Check details.elapsedDurationInSeconds
-        details_elapsed_sec = details.get('elapsedDurationInSeconds')
-        if details_elapsed_sec is not None and isinstance(details_elapsed_sec, (int, float)) and details_elapsed_sec > 0:
-            return (int(details_elapsed_sec), "details.elapsedDurationInSeconds")
+        for key in DURATION_KEYS:
+            found = probe_duration(details, key, 'details.')
+            if found:
+                return found
         
         # Check details.summaryDTO (nested structure)
         summary_dto = details.get('summaryDTO')
-        if summary_dto and isinstance(summary_dto, dict):
-            summary_elapsed = summary_dto.get('elapsedDuration')
-            if summary_elapsed is not None and isinstance(summary_elapsed, (int, float)) and summary_elapsed > 0:
-                return (int(summary_elapsed), "details.summaryDTO.elapsedDuration")
-            
-            summary_duration = summary_dto.get('duration')
-            if summary_duration is not None and isinstance(summary_duration, (int, float)) and summary_duration > 0:
-                return (int(summary_duration), "details.summaryDTO.duration")
+        if isinstance(summary_dto, dict):
+            for key in SUMMARY_DURATION_KEYS:
+                found = probe_duration(summary_dto, key, 'details.summaryDTO.')
+                if found:
+                    return found
     
     return (0, "none")
 
 
-def sync_activities_by_date_range(start_date: str, end_date: str) -> dict:
+def extract_duration_numeric(activity: dict, details: dict | None = None) -> tuple[int, str]:
+    """
+    Fast path of extract_duration() for the documented response shape.
+    
+    Reads a positive int/float activity['duration'] directly and only falls
+    back to the full extract_duration() probe when the value has another shape.
+    """
+    duration = activity.get('duration')
+    if (type(duration) is float or type(duration) is int) and duration > 0:
+        return (int(duration), "duration")
+    return extract_duration(activity, details)
+
+
+def select_duration_extractor(activities: list[dict]):
+    """
+    Pick the duration extractor for a response based on its first activity.
+    
+    When the first entry carries a plain numeric duration (the documented
+    shape), the numeric fast path is used for the whole response.
+    """
+    if activities and isinstance(activities[0].get('duration'), (int, float)):
+        return extract_duration_numeric
+    return extract_duration
+
+
+# On-disk cache of get_activity() details, keyed by activityId
+DETAILS_CACHE_PATH = project_root / 'cache' / 'garmin_details.sqlite'
+DETAILS_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60  # 30 days
+
+
+def open_details_cache() -> sqlite3.Connection | None:
+    """
+    Open (and create if needed) the activity details cache.
+    
+    Returns:
+        SQLite connection, or None if the cache cannot be opened
+        (the sync then simply fetches everything from Garmin)
+    """
+    try:
+        DETAILS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DETAILS_CACHE_PATH, timeout=10)
+        # WAL lets concurrent sync processes read while one of them writes
+        conn.execute('PRAGMA journal_mode=WAL')
+        with conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS details ('
+                'activity_id INTEGER PRIMARY KEY, fetched_at INTEGER NOT NULL, json BLOB NOT NULL)'
+            )
+        return conn
+    except sqlite3.Error as e:
+        logger.warning(f"Activity details cache unavailable ({DETAILS_CACHE_PATH}): {e}")
+        return None
+
+
+def get_cached_details(conn: sqlite3.Connection | None, activity_id: int) -> dict | None:
+    """Return cached details for an activity if present and not older than the TTL."""
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            'SELECT json FROM details WHERE activity_id = ? AND fetched_at > ?',
+            (activity_id, int(time.time()) - DETAILS_CACHE_TTL_SECONDS)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    except (sqlite3.Error, ValueError) as e:
+        logger.warning(f"Failed to read cached details for activity {activity_id}: {e}")
+        return None
+
+
+def store_cached_details(conn: sqlite3.Connection | None, activity_id: int, details: dict) -> None:
+    """Insert or refresh the cached details for an activity."""
+    if conn is None:
+        return
+    try:
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO details (activity_id, fetched_at, json) VALUES (?, ?, ?)',
+                (activity_id, int(time.time()), json.dumps(details))
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to cache details for activity {activity_id}: {e}")
+
+
+# Detail fetches in flight at once; the request rate itself is capped by
+# detail_rate_limiter at the old sequential pace (one call per 2 s)
+DETAIL_FETCH_CONCURRENCY = 4
+DETAIL_RATE_LIMIT_BURST = 1
+DETAIL_RATE_LIMIT_PER_SECOND = 0.5
+
+# Retries of rate-limited (429) detail calls, and the backoff between them
+# when the response has no Retry-After header
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_CAP_SECONDS = 60.0
+BACKOFF_JITTER_SECONDS = 1.0
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+    
+    Holds up to `capacity` tokens and refills at `rate` tokens per second;
+    each call takes one token, waiting for the refill when the bucket is empty.
+    """
+    
+    def __init__(self, capacity: int, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            
+            # Take the token now (possibly going negative) and sleep off the deficit,
+            # so concurrent callers queue up behind each other
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Shared by every range synced in this process, so --server requests draw on one budget
+detail_rate_limiter = TokenBucket(DETAIL_RATE_LIMIT_BURST, DETAIL_RATE_LIMIT_PER_SECOND)
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """
+    Return the Retry-After delay (in seconds) of a failed response, if the server sent one.
+    
+    The delay is capped at BACKOFF_CAP_SECONDS: a server asking for hours
+    would otherwise park the worker thread while the Node caller waits on it.
+    """
+    # GarminAPIError -> GarthHTTPError -> requests.HTTPError
+    http_error = getattr(getattr(error, 'original_error', None), 'error', None)
+    response = getattr(http_error, 'response', None)
+    value = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return min(BACKOFF_CAP_SECONDS, max(0.0, float(value))) if value is not None else None
+    except ValueError:
+        return None
+
+
+def throttled_call(client: GarminClientWrapper, method: str, *args, token_held: bool = False):
+    """
+    Call client.safe_call within the detail request budget.
+    
+    Rate-limited calls are retried up to MAX_RETRIES times, after the server's
+    Retry-After delay or else an exponential backoff with jitter.
+    
+    Args:
+        token_held: Skip the token for the first attempt, because the caller's
+            previous call already paid for it; retries always take one
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt or not token_held:
+            detail_rate_limiter.acquire()
+        try:
+            return client.safe_call(method, *args)
+        except GarminRateLimitError as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = retry_after_seconds(e)
+            if delay is None:
+                delay = (min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+                         + random.uniform(0, BACKOFF_JITTER_SECONDS))
+            logger.warning(f"Rate limited on {method}({', '.join(map(str, args))}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def get_activity_type_key(activity: dict) -> str:
+    """Return the activity type key from a list entry, defaulting to running."""
+    activity_type_obj = activity.get('activityType', {})
+    return activity_type_obj.get('typeKey', 'running') if isinstance(activity_type_obj, dict) else 'running'
+
+
+def fetch_activity_details(client: GarminClientWrapper, activity_id: int, activity_type_key: str) -> tuple[dict | None, bool]:
+    """
+    Fetch full details for one activity (blocking).
+    
+    For strength training the exercise sets are fetched as well and attached
+    under summaryDTO.strengthTrainingDto, where the Node side looks for them.
+    Both calls go through throttled_call, so 429s are backed off and retried;
+    the sets call shares the details call's token, so a strength activity
+    costs the request budget no more than any other.
+    
+    Returns:
+        Tuple of (details, cacheable); details are not cacheable when they are
+        missing or the exercise sets could not be fetched
+    """
+    # Use get_activity() method to get full details
+    details = throttled_call(client, 'get_activity', activity_id)
+    cacheable = details is not None
+    
+    # For strength training, we also need exercise sets
+    if details is not None and activity_type_key == 'strength_training':
+        try:
+            logger.info(f"Fetching exercise sets for activity {activity_id}...")
+            sets = throttled_call(client, 'get_activity_exercise_sets', activity_id, token_held=True)
+            if sets:
+                # Standard way to represent this in the details object
+                # so that the Node side can find it
+                if 'summaryDTO' not in details:
+                    details['summaryDTO'] = {}
+                details['summaryDTO']['strengthTrainingDto'] = sets
+        except Exception as set_err:
+            # Don't cache incomplete details; retry the sets next sync
+            cacheable = False
+            logger.warning("Failed to fetch exercise sets for activity %s: %s", activity_id, set_err)
+    
+    return details, cacheable
+
+
+async def fetch_details_concurrently(client: GarminClientWrapper, pending: list[tuple[int, str]]) -> dict:
+    """
+    Fetch details for several activities with bounded concurrency.
+    
+    The garminconnect client is blocking, so each fetch runs in the default
+    thread pool. A semaphore caps the requests in flight and every call goes
+    through detail_rate_limiter, which keeps us at the old sequential rate
+    while overlapping the response latency.
+    
+    Args:
+        client: Garmin client wrapper
+        pending: (activity_id, activity_type_key) pairs to fetch
+    
+    Returns:
+        dict mapping activity_id to the fetch_activity_details() result, or to
+        the exception raised while fetching it
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(DETAIL_FETCH_CONCURRENCY)
+    
+    async def fetch_one(activity_id: int, activity_type_key: str):
+        async with semaphore:
+            return await loop.run_in_executor(None, fetch_activity_details, client, activity_id, activity_type_key)
+    
+    results = await asyncio.gather(*(fetch_one(*item) for item in pending), return_exceptions=True)
+    return {activity_id: result for (activity_id, _), result in zip(pending, results, strict=True)}
+
+
+# Detail fields read by the Node side (activity id, duration fallbacks, HR
+# source, session stream, and strength sets under summaryDTO); used by --slim
+SLIM_DETAIL_FIELDS = (
+    'activityId',
+    'duration',
+    'elapsedDuration',
+    'elapsedDurationInSeconds',
+    'durationInSeconds',
+    'totalDuration',
+    'hrSource',
+    'summaryDTO',
+    'metadataDTO',
+    'activityDetailMetrics',
+    'metricDescriptors',
+)
+
+
+def project_fields(obj: dict, paths: tuple[str, ...]) -> dict:
+    """
+    Keep only the given dotted paths of a nested dict, preserving its nesting.
+    
+    Example: project_fields(d, ('distance', 'summaryDTO.duration')) returns
+    {'distance': ..., 'summaryDTO': {'duration': ...}}. Missing paths are omitted.
+    """
+    projected = {}
+    for path in paths:
+        keys = path.split('.')
+        value = obj
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = projected
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            target[keys[-1]] = value
+    return projected
+
+
+AUTH_FAILED_RESULT = {
+    'success': False,
+    'error': 'AUTH_FAILED',
+    'message': 'Failed to initialize Garmin client. Check credentials or run garmin-connect-mcp-auth.'
+}
+
+
+def create_client() -> GarminClientWrapper | None:
+    """
+    Load config and initialize the Garmin client with token persistence.
+    
+    Returns:
+        Client wrapper, or None if the client could not be initialized
+    """
+    # Load config from .env.local (same as Node.js uses)
+    env_path = project_root / '.env.local'
+    if env_path.exists():
+        load_dotenv(env_path)
+    else:
+        # Fallback to .env in MCP directory
+        load_dotenv(project_root / 'garmin-connect-mcp-main' / '.env')
+    
+    config = load_config()
+    
+    # Initialize client (uses token persistence if available)
+    # This will:
+    # 1. Try to login with existing tokens from ~/.garminconnect/
+    # 2. Fall back to credential login if tokens don't exist
+    # 3. Save tokens for future use
+    logger.info("Initializing Garmin client with token persistence...")
+    garmin = init_garmin_client(config)
+    if not garmin:
+        return None
+    
+    logger.info("Garmin client initialized successfully (using token persistence)")
+    return GarminClientWrapper(garmin)
+
+
+async def sync_activities_by_date_range(
+    start_date: str,
+    end_date: str,
+    client: GarminClientWrapper | None = None,
+    detail_fields: tuple[str, ...] | None = None
+) -> dict:
     """
     Sync Garmin activities for a date range using MCP client with token persistence.
     
@@ -130,37 +463,19 @@ def sync_activities_by_date_range(start_date: str, end_date: str) -> dict:
     Args:
         start_date: Start date in YYYY-MM-DD format
         end_date: End date in YYYY-MM-DD format
+        client: Already initialized client to reuse (server mode); a new one
+            is created when omitted
+        detail_fields: Dotted paths to keep from each activity's details
+            (--fields / --slim); the full details are returned when omitted
     
     Returns:
         dict with 'success', 'activities', 'error' keys
     """
     try:
-        # Load config from .env.local (same as Node.js uses)
-        env_path = project_root / '.env.local'
-        if env_path.exists():
-            load_dotenv(env_path)
-        else:
-            # Fallback to .env in MCP directory
-            load_dotenv(project_root / 'garmin-connect-mcp-main' / '.env')
-        
-        config = load_config()
-        
-        # Initialize client (uses token persistence if available)
-        # This will:
-        # 1. Try to login with existing tokens from ~/.garminconnect/
-        # 2. Fall back to credential login if tokens don't exist
-        # 3. Save tokens for future use
-        logger.info("Initializing Garmin client with token persistence...")
-        garmin = init_garmin_client(config)
-        if not garmin:
-            return {
-                'success': False,
-                'error': 'AUTH_FAILED',
-                'message': 'Failed to initialize Garmin client. Check credentials or run garmin-connect-mcp-auth.'
-            }
-        
-        logger.info("Garmin client initialized successfully (using token persistence)")
-        client = GarminClientWrapper(garmin)
+        if client is None:
+            client = create_client()
+            if client is None:
+                return AUTH_FAILED_RESULT
         
         # Use efficient date-range query (single API call per date range)
         # This is MUCH more efficient than pagination
@@ -168,9 +483,47 @@ def sync_activities_by_date_range(start_date: str, end_date: str) -> dict:
         
         logger.info(f"Found {len(activities)} activities in date range {start_date} to {end_date}")
         
-        # Format activities and fetch details for each
+        # Specialize duration extraction to the shape of this response
+        extract = select_duration_extractor(activities)
+        
+        # Resolve details from the on-disk cache first; only misses go to Garmin
+        details_cache = open_details_cache()
+        try:
+            details_by_id = {}
+            pending = []
+            for activity in activities:
+                activity_id = activity.get('activityId')
+                if not activity_id:
+                    continue
+                cached = get_cached_details(details_cache, activity_id)
+                if cached is not None:
+                    details_by_id[activity_id] = cached
+                else:
+                    pending.append((activity_id, get_activity_type_key(activity)))
+            
+            if details_by_id:
+                logger.info(f"Using cached details for {len(details_by_id)} activities")
+            
+            # Fetch full activity details (needed for session stream)
+            if pending:
+                logger.info(f"Fetching details for {len(pending)} activities...")
+                fetched = await fetch_details_concurrently(client, pending)
+                for activity_id, result in fetched.items():
+                    if isinstance(result, BaseException):
+                        # If details fetch fails, still include basic info
+                        logger.warning(f"Failed to fetch details for activity {activity_id}: {result}")
+                        continue
+                    details, cacheable = result
+                    details_by_id[activity_id] = details
+                    if cacheable:
+                        store_cached_details(details_cache, activity_id, details)
+        finally:
+            if details_cache is not None:
+                details_cache.close()
+        
+        # Format activities
         formatted_activities = []
-        for i, activity in enumerate(activities):
+        for activity in activities:
             try:
                 # Extract basic info
                 activity_id = activity.get('activityId')
@@ -178,41 +531,11 @@ def sync_activities_by_date_range(start_date: str, end_date: str) -> dict:
                     continue
                 
                 # Extract activity type
-                activity_type_obj = activity.get('activityType', {})
-                activity_type_key = activity_type_obj.get('typeKey', 'running') if isinstance(activity_type_obj, dict) else 'running'
-                
-                # Fetch full activity details (needed for session stream)
-                # Add small delay to avoid rate limiting
-                if i > 0:
-                    import time
-                    time.sleep(2)  # 2 second delay between detail fetches
-                
-                details = None
-                try:
-                    # Use get_activity() method to get full details
-                    details = client.safe_call('get_activity', activity_id)
-                    
-                    # For strength training, we also need exercise sets
-                    if activity_type_key == 'strength_training':
-                        try:
-                            logger.info(f"Fetching exercise sets for activity {activity_id}...")
-                            sets = client.safe_call('get_activity_exercise_sets', activity_id)
-                            if sets:
-                                # Standard way to represent this in the details object
-                                # so that the Node side can find it
-                                if 'summaryDTO' not in details:
-                                    details['summaryDTO'] = {}
-                                details['summaryDTO']['strengthTrainingDto'] = sets
-                        except Exception as set_err:
-                            logger.warn(f"Failed to fetch exercise sets for activity {activity_id}: {set_err}")
-                            
-                except Exception as detail_err:
-                    # If details fetch fails, still include basic info
-                    logger.warning(f"Failed to fetch details for activity {activity_id}: {detail_err}")
-                    details = None
+                activity_type_key = get_activity_type_key(activity)
+                details = details_by_id.get(activity_id)
                 
                 # Extract duration with fallback to details
-                duration_seconds, duration_source = extract_duration(activity, details)
+                duration_seconds, duration_source = extract(activity, details)
                 
                 # Log duration extraction for debugging
                 if duration_seconds > 0:
@@ -241,10 +564,11 @@ def sync_activities_by_date_range(start_date: str, end_date: str) -> dict:
                     'avgRunCadence': activity.get('avgRunCadence'),
                     'calories': activity.get('calories'),
                     'elevationGain': activity.get('elevationGain'),
-                    'details': details  # Full activity details for session processing
+                    # Full activity details for session processing, unless projected
+                    'details': project_fields(details, detail_fields) if details and detail_fields else details
                 })
             except Exception as e:
-                logger.warn(f"Error processing activity: {e}")
+                logger.warning("Error processing activity: %s", e)
                 continue
         
         return {
@@ -279,20 +603,88 @@ def sync_activities_by_date_range(start_date: str, end_date: str) -> dict:
         }
 
 
+def parse_args(args: list[str]) -> tuple[list[str], tuple[str, ...] | None, bool] | None:
+    """
+    Split command line arguments into positionals and options.
+    
+    Returns:
+        Tuple of (positional args, detail fields or None, server mode),
+        or None if an option is not recognized
+    """
+    positional = []
+    detail_fields = None
+    server = False
+    for arg in args:
+        if arg == '--server':
+            server = True
+        elif arg == '--slim':
+            detail_fields = SLIM_DETAIL_FIELDS
+        elif arg.startswith('--fields='):
+            detail_fields = tuple(f for f in arg[len('--fields='):].split(',') if f)
+        elif arg.startswith('--'):
+            return None
+        else:
+            positional.append(arg)
+    return positional, detail_fields, server
+
+
+def serve(detail_fields: tuple[str, ...] | None = None) -> int:
+    """
+    Serve sync requests read from stdin, one JSON object per line.
+    
+    Each line is {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"} and gets one
+    JSON result line on stdout. Config loading and client authentication
+    happen once for the whole process instead of once per date range.
+    
+    Returns:
+        Process exit code
+    """
+    try:
+        client = create_client()
+    except Exception as e:
+        client = None
+        logger.error(f"Failed to initialize Garmin client: {e}")
+    if client is None:
+        print(json.dumps(AUTH_FAILED_RESULT), flush=True)
+        return 1
+    
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            start_date = request['start']
+            end_date = request['end']
+        except (ValueError, KeyError, TypeError):
+            print(json.dumps({
+                'success': False,
+                'error': 'INVALID_REQUEST',
+                'message': 'Expected a JSON line like {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}'
+            }), flush=True)
+            continue
+        
+        result = asyncio.run(sync_activities_by_date_range(start_date, end_date, client, detail_fields))
+        print(json.dumps(result), flush=True)
+    
+    return 0
+
+
 if __name__ == '__main__':
-    if len(sys.argv) != 3:
+    parsed = parse_args(sys.argv[1:])
+    if parsed is not None and parsed[2] and not parsed[0]:
+        sys.exit(serve(parsed[1]))
+    
+    if parsed is None or parsed[2] or len(parsed[0]) != 2:
         print(json.dumps({
             'success': False,
             'error': 'INVALID_ARGS',
-            'message': 'Usage: sync-garmin-mcp.py <start_date> <end_date>'
+            'message': 'Usage: sync-garmin-mcp.py [--slim | --fields=a,b.c] (<start_date> <end_date> | --server)'
         }))
         sys.exit(1)
     
-    start_date = sys.argv[1]
-    end_date = sys.argv[2]
+    (start_date, end_date), detail_fields, _ = parsed
     
-    result = sync_activities_by_date_range(start_date, end_date)
+    result = asyncio.run(sync_activities_by_date_range(start_date, end_date, detail_fields=detail_fields))
     print(json.dumps(result))
     
     sys.exit(0 if result['success'] else 1)
-
@@ -8,14 +8,38 @@ Uses the same client initialization as the MCP server for:
 - OAuth token persistence (~/.garminconnect/)
 - Access to get_hrv_data method (not available in npm garminconnect)
 - Proper error handling
+
+Usage:
+    sync-garmin-wellness-mcp.py <start_date> <end_date>   # one range, one JSON result
+    sync-garmin-wellness-mcp.py <start_date> <end_date> --stream
+                                                          # one JSON line per day as it completes, then
+                                                          # {"done": true, "success", "count", "entries_with_data"}
+    sync-garmin-wellness-mcp.py --server                  # JSON lines on stdin/stdout, one client for all ranges
+    sync-garmin-wellness-mcp.py --socket[=PATH]           # daemon on a Unix socket (default /tmp/garmin-sync.sock)
 """
 
-import sys
+from __future__ import annotations
+
+import asyncio
+import contextlib
 import json
 import logging
+import os
+import random
+import socket
+import stat
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
-from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+try:
+    import orjson
+except ImportError:  # optional speedup (garmin-connect-mcp "speedups" extra)
+    orjson = None
 
 # Setup logging to stderr (won't interfere with JSON stdout)
 logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stderr)
@@ -33,17 +57,384 @@ if not mcp_src.exists():
     sys.exit(1)
 sys.path.insert(0, str(mcp_src))
 
-from garmin_connect_mcp.client import (
-    init_garmin_client,
-    GarminClientWrapper,
-    GarminRateLimitError,
-    GarminAuthenticationError,
-    GarminAPIError
+# The MCP client (garth, requests, pydantic) takes about half a second to import,
+# so it is imported where first needed; bad arguments are rejected without it
+if TYPE_CHECKING:
+    from garmin_connect_mcp.client import GarminClientWrapper
+
+
+def encode_json(obj) -> bytes:
+    """Encode obj as one line of JSON (via orjson when installed)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj) + b'\n'
+        except TypeError:  # e.g. integers wider than 64 bits
+            pass
+    return json.dumps(obj).encode() + b'\n'
+
+
+def write_json(obj) -> None:
+    """Write obj to stdout as one line of JSON."""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(encode_json(obj))
+    sys.stdout.buffer.flush()
+
+
+# Request budget: bursts of up to RATE_LIMIT_BURST calls, refilled at
+# RATE_LIMIT_PER_SECOND (about what the old fixed 1s pause per date allowed)
+RATE_LIMIT_BURST = 5
+RATE_LIMIT_PER_SECOND = 2.0
+
+# Retries of rate-limited (429) and transient (network, 5xx) failures, and the
+# backoff between them when the response has no Retry-After header
+MAX_RETRIES = 3
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_CAP_SECONDS = 60.0
+BACKOFF_JITTER_SECONDS = 1.0
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+    
+    Holds up to `capacity` tokens and refills at `rate` tokens per second;
+    each call takes one token, waiting for the refill when the bucket is empty.
+    """
+    
+    def __init__(self, capacity: int, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            
+            # Take the token now (possibly going negative) and sleep off the deficit,
+            # so concurrent callers queue up behind each other
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """
+    Return the Retry-After delay (in seconds) of a failed response, if the server sent one.
+    
+    The delay is capped at BACKOFF_CAP_SECONDS: a server asking for hours
+    would otherwise park the worker thread while the Node caller waits on it.
+    """
+    # GarminAPIError -> GarthHTTPError -> requests.HTTPError
+    http_error = getattr(getattr(error, 'original_error', None), 'error', None)
+    response = getattr(http_error, 'response', None)
+    value = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return min(BACKOFF_CAP_SECONDS, max(0.0, float(value))) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether a safe_call failure is worth retrying: rate limits, network
+    errors and 5xx responses. Authentication and not-found errors are final.
+    """
+    import requests
+    from garmin_connect_mcp.client import (
+        GarminAuthenticationError,
+        GarminNotFoundError,
+        GarminRateLimitError,
+    )
+    
+    if isinstance(error, GarminRateLimitError):
+        return True
+    if isinstance(error, (GarminAuthenticationError, GarminNotFoundError)):
+        return False
+    
+    original = getattr(error, 'original_error', None)
+    if isinstance(original, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(getattr(original, 'error', None), 'response', None)
+    return response is not None and response.status_code >= 500
+
+
+def throttled_call(bucket: TokenBucket, client: GarminClientWrapper, method: str, *args):
+    """
+    Call client.safe_call within the request budget.
+    
+    Rate-limited and transient failures are retried up to MAX_RETRIES times,
+    after the server's Retry-After delay or else an exponential backoff with
+    jitter; authentication errors fail fast.
+    """
+    from garmin_connect_mcp.client import GarminAPIError, GarminRateLimitError
+    
+    for attempt in range(MAX_RETRIES + 1):
+        bucket.acquire()
+        try:
+            return client.safe_call(method, *args)
+        except GarminAPIError as e:
+            if attempt == MAX_RETRIES or not is_retryable(e):
+                raise
+            delay = retry_after_seconds(e)
+            if delay is None:
+                delay = (min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+                         + random.uniform(0, BACKOFF_JITTER_SECONDS))
+            reason = 'Rate limited' if isinstance(e, GarminRateLimitError) else f'Transient error ({e})'
+            logger.warning(f"{reason} on {method}({', '.join(map(str, args))}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+# Where each endpoint keeps the value, most common location first
+HRV_PATHS = (
+    ('hrvSummary', 'lastNightAvg'),
+    ('hrvSummary', 'avgOvernightHrv'),
+    ('hrvSummaryDTO', 'lastNightAvg'),
+    ('hrvSummaryDTO', 'avgOvernightHrv'),
+    ('lastNightAvg',),
+    ('avgOvernightHrv',),
+    ('averageHrv',),
+    ('overnightAvg',),
+    ('hrv', 'lastNightAvg'),
+    ('hrv', 'avgOvernightHrv'),
 )
-from garmin_connect_mcp.auth import load_config
+RHR_DAY_PATHS = (('restingHeartRate',), ('rhr',), ('value',))
+HEART_RATES_RHR_PATHS = (('restingHeartRate',), ('rhr',), ('resting_hr',))
+
+
+def first_path(data, paths: tuple[tuple[str, ...], ...]):
+    """
+    Return the value at the first of `paths` (key sequences into nested dicts)
+    that holds a non-empty value, or None. A bare number is returned as is.
+    """
+    if isinstance(data, (int, float)):
+        return data
+    if not isinstance(data, dict):
+        return None
+    for path in paths:
+        value = data
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if value:
+            return value
+    return None
+
+
+def fetch_hrv(bucket: TokenBucket, client: GarminClientWrapper, date_str: str) -> float | None:
+    """Fetch the average overnight (sleep) HRV for a date."""
+    # This gets the average overnight HRV (sleep HRV) - the most relevant metric
+    try:
+        hrv_data = throttled_call(bucket, client, 'get_hrv_data', date_str)
+        if not hrv_data:
+            return None
+        
+        hrv = first_path(hrv_data, HRV_PATHS)
+        if hrv is None:
+            logger.debug(f"HRV data structure for {date_str} doesn't match expected format: {hrv_data}")
+            return None
+        
+        logger.debug(f"HRV extracted for {date_str}: {float(hrv)}ms (avg overnight/sleep HRV)")
+        return float(hrv)
+    except Exception as e:
+        logger.warning(f"HRV fetch failed for {date_str}: {type(e).__name__}: {str(e)}")
+        return None
+
+
+# Days per HRV range request (the page size of garth's DailyHRV)
+HRV_RANGE_PAGE_DAYS = 28
+
+
+def fetch_hrv_range(bucket: TokenBucket, client: GarminClientWrapper, dates: list[str]) -> dict[str, float] | None:
+    """
+    Fetch the overnight HRV of consecutive dates with one request per 28 days.
+    
+    Returns:
+        dict of date -> HRV (dates without a reading are absent), or None if
+        the client has no garth session or a request failed; callers then
+        fall back to fetch_hrv per date
+    """
+    garth_client = getattr(client.client, 'garth', None)
+    if garth_client is None or not dates:
+        return None
+    
+    from garth import DailyHRV
+    
+    hrv_by_date = {}
+    end = date.fromisoformat(dates[-1])
+    remaining = len(dates)
+    try:
+        while remaining > 0:
+            period = min(remaining, HRV_RANGE_PAGE_DAYS)
+            bucket.acquire()
+            for summary in DailyHRV.list(end, period, client=garth_client):
+                if summary.last_night_avg is not None:
+                    hrv_by_date[summary.calendar_date.isoformat()] = float(summary.last_night_avg)
+            end -= timedelta(days=period)
+            remaining -= period
+    except Exception as e:
+        logger.warning(f"HRV range fetch failed, falling back to per-date requests: {type(e).__name__}: {str(e)}")
+        return None
+    
+    logger.debug(f"HRV range fetch returned {len(hrv_by_date)}/{len(dates)} days")
+    return hrv_by_date
+
+
+def fetch_rhr(bucket: TokenBucket, client: GarminClientWrapper, date_str: str) -> float | None:
+    """Fetch the resting heart rate for a date (fallback when the sleep data has none)."""
+    # Try multiple methods as different Garmin API versions may use different endpoints
+    try:
+        rhr = None
+        
+        # Method 1: Try get_rhr_day (most direct)
+        try:
+            rhr = first_path(throttled_call(bucket, client, 'get_rhr_day', date_str), RHR_DAY_PATHS)
+        except Exception as rhr_err:
+            logger.debug(f"get_rhr_day failed for {date_str}, trying alternative: {rhr_err}")
+        
+        # Method 2: Try get_heart_rates (may contain RHR)
+        if rhr is None:
+            try:
+                hr_data = throttled_call(bucket, client, 'get_heart_rates', date_str)
+                if isinstance(hr_data, dict):
+                    rhr = first_path(hr_data, HEART_RATES_RHR_PATHS)
+            except Exception as hr_err:
+                logger.debug(f"get_heart_rates failed for {date_str}: {hr_err}")
+        
+        if rhr is None:
+            return None
+        
+        logger.debug(f"RHR extracted for {date_str}: {float(rhr)} bpm")
+        return float(rhr)
+    except Exception as e:
+        logger.warning(f"RHR fetch failed for {date_str}: {type(e).__name__}: {str(e)}")
+        return None
+
+
+def fetch_sleep(bucket: TokenBucket, client: GarminClientWrapper, date_str: str) -> dict | None:
+    """Fetch the sleep payload for a date (None if unavailable)."""
+    try:
+        return throttled_call(bucket, client, 'get_sleep_data', date_str) or None
+    except Exception as e:
+        logger.warning(f"Sleep data fetch failed for {date_str}: {type(e).__name__}: {str(e)}")
+        return None
+
+
+def extract_sleep(sleep_data) -> tuple:
+    """
+    Pick the wellness fields out of a get_sleep_data payload.
+    
+    Returns:
+        Tuple of (sleep seconds, overall sleep score, resting heart rate),
+        each None where missing
+    """
+    if not isinstance(sleep_data, dict):
+        return None, None, None
+    dto = sleep_data.get('dailySleepDTO') or {}
+    scores = dto.get('sleepScores')
+    overall = scores.get('overall') if isinstance(scores, dict) else None
+    score = overall.get('value') if isinstance(overall, dict) else None
+    return dto.get('sleepTimeSeconds'), score, sleep_data.get('restingHeartRate')
+
+
+# Dates processed at once; each has its HRV and sleep requests in flight together
+WELLNESS_DATE_CONCURRENCY = 4
+
+# Connections kept open to Garmin: one per request that can be in flight
+HTTP_POOL_MAXSIZE = WELLNESS_DATE_CONCURRENCY * 2
+
+
+def configure_http_pool(garmin) -> None:
+    """
+    Size the client's connection pool for the concurrent fetches.
+    
+    garth already sends every request through one keep-alive requests.Session;
+    this makes sure that the pool holds a connection per in-flight request, so
+    none is closed and re-handshaked. garth's urllib3 retries are turned off
+    and 5xx responses come back as plain HTTP errors: throttled_call owns the
+    retry policy (backoff, Retry-After, rate budget), and retrying in both
+    layers would multiply the requests during an outage.
+    """
+    garth_client = getattr(garmin, 'garth', None)
+    if garth_client is None or not hasattr(garth_client, 'configure'):
+        logger.debug("Garmin client has no garth session, keeping its default connection pool")
+        return
+    garth_client.configure(pool_maxsize=HTTP_POOL_MAXSIZE, retries=0, status_forcelist=())
+
 
+# Once sleep data has supplied the RHR for this many dates of a range, the RHR
+# endpoints are no longer queried for recorded nights whose sleep data lacks it
+SLEEP_RHR_TRUST_DATES = 3
 
-def sync_wellness_by_date_range(start_date: str, end_date: str) -> dict:
+
+AUTH_FAILED_RESULT = {
+    'success': False,
+    'error': 'AUTH_FAILED',
+    'message': 'Failed to initialize Garmin client. Check credentials or run garmin-connect-mcp-auth.'
+}
+
+
+@lru_cache(maxsize=1)
+def load_env_config():
+    """Load .env.local (or the MCP .env) and the Garmin config, once per process."""
+    from garmin_connect_mcp.auth import load_config
+    
+    # A parent process that passes the credentials in the environment spares us the file
+    if not (os.environ.get('GARMIN_EMAIL') and os.environ.get('GARMIN_PASSWORD')):
+        from dotenv import load_dotenv
+        
+        # Load config from .env.local (same as Node.js uses)
+        env_path = project_root / '.env.local'
+        if env_path.exists():
+            load_dotenv(env_path)
+        else:
+            # Fallback to .env in MCP directory
+            load_dotenv(project_root / 'garmin-connect-mcp-main' / '.env')
+    
+    return load_config()
+
+
+def create_client() -> GarminClientWrapper | None:
+    """
+    Initialize the Garmin client with token persistence.
+    
+    Returns:
+        Client wrapper, or None if the client could not be initialized
+    """
+    from garmin_connect_mcp.client import GarminClientWrapper, init_garmin_client
+    
+    config = load_env_config()
+    
+    # Initialize client (uses token persistence if available)
+    logger.info("Initializing Garmin client with token persistence...")
+    garmin = init_garmin_client(config)
+    if not garmin:
+        return None
+    
+    logger.info("Garmin client initialized successfully (using token persistence)")
+    configure_http_pool(garmin)
+    return GarminClientWrapper(garmin)
+
+
+INVALID_REQUEST_RESULT = {
+    'success': False,
+    'error': 'INVALID_REQUEST',
+    'message': 'Expected a JSON line like {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}'
+}
+
+# One request budget per process, shared by every range it syncs
+rate_limiter = TokenBucket(RATE_LIMIT_BURST, RATE_LIMIT_PER_SECOND)
+
+
+async def sync_wellness_by_date_range(
+    start_date: str,
+    end_date: str,
+    client: GarminClientWrapper | None = None,
+    on_entry=None
+) -> dict:
     """
     Sync Garmin wellness data (HRV, RHR, Sleep) for a date range using MCP client.
     
@@ -52,197 +443,129 @@ def sync_wellness_by_date_range(start_date: str, end_date: str) -> dict:
     - Access to get_hrv_data method (not in npm library)
     - Proper error handling with custom exceptions
     
+    The client is synchronous, so its calls run in the default thread pool:
+    HRV is fetched for the whole range with a few range requests first (or
+    alongside each date's sleep request where ranges are unavailable), and
+    the per-date requests run for up to WELLNESS_DATE_CONCURRENCY dates at a
+    time, with the token bucket keeping the overall rate in check.
+    
     Args:
         start_date: Start date in YYYY-MM-DD format
         end_date: End date in YYYY-MM-DD format
+        client: Initialized client to reuse; created from config when omitted
+        on_entry: Called with each day's entry as soon as it is complete
+            (in completion order, which may differ from date order)
     
     Returns:
         dict with 'success', 'wellness_data', 'count' keys
     """
+    from garmin_connect_mcp.client import (
+        GarminAPIError,
+        GarminAuthenticationError,
+        GarminRateLimitError,
+    )
+    
     try:
-        # Load config from .env.local (same as Node.js uses)
-        env_path = project_root / '.env.local'
-        if env_path.exists():
-            load_dotenv(env_path)
-        else:
-            # Fallback to .env in MCP directory
-            load_dotenv(project_root / 'garmin-connect-mcp-main' / '.env')
+        if client is None:
+            client = create_client()
+            if client is None:
+                return AUTH_FAILED_RESULT
         
-        config = load_config()
+        # Generate date list
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        # date.isoformat() is YYYY-MM-DD and skips strftime's format parsing
+        dates = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
         
-        # Initialize client (uses token persistence if available)
-        logger.info("Initializing Garmin client with token persistence...")
-        garmin = init_garmin_client(config)
-        if not garmin:
-            return {
-                'success': False,
-                'error': 'AUTH_FAILED',
-                'message': 'Failed to initialize Garmin client. Check credentials or run garmin-connect-mcp-auth.'
-            }
+        logger.info(f"Fetching wellness data for {len(dates)} days ({start_date} to {end_date})")
         
-        logger.info("Garmin client initialized successfully (using token persistence)")
-        client = GarminClientWrapper(garmin)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(WELLNESS_DATE_CONCURRENCY)
+        done = 0
+        entries_with_data = 0
         
-        # Generate date list
-        start = datetime.strptime(start_date, '%Y-%m-%d')
-        end = datetime.strptime(end_date, '%Y-%m-%d')
-        dates = []
-        current = start
-        while current <= end:
-            dates.append(current.strftime('%Y-%m-%d'))
-            current += timedelta(days=1)
+        def finish(entry: dict) -> dict:
+            nonlocal done, entries_with_data
+            # Tally days with actual data as they complete, instead of another pass at the end
+            if entry['hrv'] is not None or entry['rhr'] is not None or entry['sleepSeconds'] is not None:
+                entries_with_data += 1
+            if on_entry is not None:
+                on_entry(entry)
+            done += 1
+            if done % 5 == 0:
+                logger.info(f"Fetched wellness data for {done}/{len(dates)} days...")
+            return entry
         
-        logger.info(f"Fetching wellness data for {len(dates)} days ({start_date} to {end_date})")
+        # HRV for the whole range comes from a few range requests, fetched once up
+        # front so no date holds a slot waiting for it; None means per-date requests
+        hrv_by_date = await loop.run_in_executor(None, fetch_hrv_range, rate_limiter, client, dates)
         
-        # Fetch wellness data for each date
-        wellness_data = []
-        for i, date_str in enumerate(dates):
-            try:
-                # Add delay to avoid rate limiting
-                if i > 0:
-                    import time
-                    time.sleep(1)  # 1 second delay between requests
-                
-                entry = {'date': date_str}
-                
-                # 1. Fetch HRV data (using MCP client method)
-                # This gets the average overnight HRV (sleep HRV) - the most relevant metric
+        async def process_date(date_str: str) -> tuple[dict, bool | None]:
+            """
+            Fetch HRV and sleep for a date. Returns the entry and, if it still
+            lacks an RHR, whether the sleep payload recorded a night's sleep
+            (None once the entry is complete).
+            """
+            async with semaphore:
                 try:
-                    hrv_data = client.safe_call('get_hrv_data', date_str)
-                    # Extract average overnight HRV (sleep HRV) from various possible structures
-                    if hrv_data:
-                        # The get_hrv_data method returns overnight/average HRV during sleep
-                        # Try different possible field names and nested structures
-                        hrv = None
-                        
-                        # Check for nested hrvSummary structure
-                        if isinstance(hrv_data, dict):
-                            # Try hrvSummary.lastNightAvg (most common)
-                            hrv_summary = hrv_data.get('hrvSummary') or hrv_data.get('hrvSummaryDTO')
-                            if hrv_summary and isinstance(hrv_summary, dict):
-                                hrv = hrv_summary.get('lastNightAvg') or hrv_summary.get('avgOvernightHrv')
-                            
-                            # Try direct fields
-                            if hrv is None:
-                                hrv = (hrv_data.get('lastNightAvg') or
-                                       hrv_data.get('avgOvernightHrv') or
-                                       hrv_data.get('averageHrv') or
-                                       hrv_data.get('overnightAvg'))
-                            
-                            # Try nested hrv object
-                            if hrv is None:
-                                hrv_obj = hrv_data.get('hrv')
-                                if isinstance(hrv_obj, dict):
-                                    hrv = hrv_obj.get('lastNightAvg') or hrv_obj.get('avgOvernightHrv')
-                            
-                            # If it's a simple number, use it directly
-                            if hrv is None and isinstance(hrv_data, (int, float)):
-                                hrv = hrv_data
-                        
-                        if hrv is not None:
-                            entry['hrv'] = float(hrv)
-                            logger.debug(f"HRV extracted for {date_str}: {entry['hrv']}ms (avg overnight/sleep HRV)")
-                        else:
-                            logger.debug(f"HRV data structure for {date_str} doesn't match expected format: {hrv_data}")
-                            entry['hrv'] = None
+                    # Sleep first: its payload usually carries the RHR as well
+                    if hrv_by_date is not None:
+                        hrv = hrv_by_date.get(date_str)
+                        sleep_data = await loop.run_in_executor(None, fetch_sleep, rate_limiter, client, date_str)
                     else:
-                        entry['hrv'] = None
-                except Exception as e:
-                    logger.warning(f"HRV fetch failed for {date_str}: {type(e).__name__}: {str(e)}")
-                    entry['hrv'] = None
-                
-                # 2. Fetch RHR (resting heart rate)
-                # Try multiple methods as different Garmin API versions may use different endpoints
-                try:
-                    rhr = None
+                        hrv, sleep_data = await asyncio.gather(
+                            loop.run_in_executor(None, fetch_hrv, rate_limiter, client, date_str),
+                            loop.run_in_executor(None, fetch_sleep, rate_limiter, client, date_str),
+                        )
+                    entry = {'date': date_str, 'hrv': hrv, 'rhr': None}
                     
-                    # Method 1: Try get_rhr_day (most direct)
-                    try:
-                        rhr_data = client.safe_call('get_rhr_day', date_str)
-                        if rhr_data is not None:
-                            # Handle different response formats
-                            if isinstance(rhr_data, (int, float)):
-                                rhr = float(rhr_data)
-                            elif isinstance(rhr_data, dict):
-                                rhr = (rhr_data.get('restingHeartRate') or
-                                       rhr_data.get('rhr') or
-                                       rhr_data.get('value'))
-                                if rhr is not None:
-                                    rhr = float(rhr)
-                    except Exception as rhr_err:
-                        logger.debug(f"get_rhr_day failed for {date_str}, trying alternative: {rhr_err}")
+                    entry['sleepSeconds'], entry['sleepScore'], sleep_rhr = extract_sleep(sleep_data)
+                    if sleep_rhr is not None:
+                        entry['rhr'] = float(sleep_rhr)
+                        logger.debug(f"RHR extracted from sleep data for {date_str}: {entry['rhr']} bpm")
+                        return finish(entry), None
                     
-                    # Method 2: Try get_heart_rates (may contain RHR)
-                    if rhr is None:
-                        try:
-                            hr_data = client.safe_call('get_heart_rates', date_str)
-                            if hr_data and isinstance(hr_data, dict):
-                                rhr = (hr_data.get('restingHeartRate') or
-                                       hr_data.get('rhr') or
-                                       hr_data.get('resting_hr'))
-                                if rhr is not None:
-                                    rhr = float(rhr)
-                        except Exception as hr_err:
-                            logger.debug(f"get_heart_rates failed for {date_str}: {hr_err}")
+                    return entry, sleep_data is not None and entry['sleepSeconds'] is not None
                     
-                    # Method 3: Try sleep data (often includes RHR) - but we'll check this after fetching sleep data
-                    # to avoid duplicate API calls
-                    
-                    entry['rhr'] = rhr
-                    if rhr is not None:
-                        logger.debug(f"RHR extracted for {date_str}: {entry['rhr']} bpm")
-                        
-                except Exception as e:
-                    logger.warning(f"RHR fetch failed for {date_str}: {type(e).__name__}: {str(e)}")
-                    entry['rhr'] = None
-                
-                # 3. Fetch Sleep data (also check for RHR if not found above)
-                try:
-                    sleep_data = client.safe_call('get_sleep_data', date_str)
-                    if sleep_data:
-                        dto = sleep_data.get('dailySleepDTO', {})
-                        entry['sleepSeconds'] = dto.get('sleepTimeSeconds')
-                        entry['sleepScore'] = (dto.get('sleepScores', {}).get('overall', {}).get('value')
-                                              if isinstance(dto.get('sleepScores'), dict) else None)
-                        
-                        # Sleep data often includes RHR - use it if we didn't get it from other methods
-                        if entry['rhr'] is None and isinstance(sleep_data, dict):
-                            sleep_rhr = sleep_data.get('restingHeartRate')
-                            if sleep_rhr is not None:
-                                entry['rhr'] = float(sleep_rhr)
-                                logger.debug(f"RHR extracted from sleep data for {date_str}: {entry['rhr']} bpm")
-                    else:
-                        entry['sleepSeconds'] = None
-                        entry['sleepScore'] = None
                 except Exception as e:
-                    logger.warning(f"Sleep data fetch failed for {date_str}: {type(e).__name__}: {str(e)}")
-                    entry['sleepSeconds'] = None
-                    entry['sleepScore'] = None
-                
-                wellness_data.append(entry)
-                
-                if (i + 1) % 5 == 0:
-                    logger.info(f"Fetched wellness data for {i + 1}/{len(dates)} days...")
-                    
-            except Exception as e:
-                logger.error(f"Critical error fetching wellness data for {date_str}: {type(e).__name__}: {str(e)}")
-                import traceback
-                logger.error(f"Traceback: {traceback.format_exc()}")
-                # Still add entry with None values so we don't lose track of the date
-                wellness_data.append({
-                    'date': date_str,
-                    'hrv': None,
-                    'rhr': None,
-                    'sleepSeconds': None,
-                    'sleepScore': None
-                })
-                continue
+                    logger.error(f"Critical error fetching wellness data for {date_str}: {type(e).__name__}: {str(e)}")
+                    import traceback
+                    logger.error(f"Traceback: {traceback.format_exc()}")
+                    # Still add entry with None values so we don't lose track of the date
+                    return finish({
+                        'date': date_str,
+                        'hrv': None,
+                        'rhr': None,
+                        'sleepSeconds': None,
+                        'sleepScore': None
+                    }), None
+        
+        async def lookup_rhr(entry: dict) -> dict:
+            async with semaphore:
+                entry['rhr'] = await loop.run_in_executor(None, fetch_rhr, rate_limiter, client, entry['date'])
+            return finish(entry)
+        
+        # Fetch wellness data for each date (results keep the date order)
+        results = await asyncio.gather(*(process_date(d) for d in dates))
         
-        # Count how many entries have actual data
-        entries_with_data = sum(1 for entry in wellness_data 
-                               if entry.get('hrv') is not None or 
-                                  entry.get('rhr') is not None or 
-                                  entry.get('sleepSeconds') is not None)
+        # Fall back to the RHR endpoints for dates still without an RHR. Dates without
+        # a recorded night (failed call, no sleep logged) always are; a recorded night
+        # without the RHR is taken as "no RHR that day" once this account's sleep data
+        # has proven to carry it. Counted over the whole range, so the outcome does
+        # not depend on completion order
+        sleep_rhr_dates = sum(1 for entry, sleep_recorded in results
+                              if sleep_recorded is None and entry['rhr'] is not None)
+        trust_sleep_rhr = sleep_rhr_dates >= SLEEP_RHR_TRUST_DATES
+        fallback = []
+        for entry, sleep_recorded in results:
+            if sleep_recorded is None:
+                continue
+            if sleep_recorded and trust_sleep_rhr:
+                finish(entry)
+            else:
+                fallback.append(lookup_rhr(entry))
+        await asyncio.gather(*fallback)
+        wellness_data = [entry for entry, _ in results]
         
         logger.info(f"Fetched wellness data for {len(wellness_data)} days ({entries_with_data} with data, {len(wellness_data) - entries_with_data} empty)")
         
@@ -279,19 +602,165 @@ def sync_wellness_by_date_range(start_date: str, end_date: str) -> dict:
         }
 
 
+def serve() -> int:
+    """
+    Serve sync requests read from stdin, one JSON object per line.
+    
+    Each line is {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"} and gets one
+    JSON result line on stdout. Config loading and client authentication
+    happen once for the whole process instead of once per date range.
+    
+    Returns:
+        Process exit code
+    """
+    try:
+        client = create_client()
+    except Exception as e:
+        client = None
+        logger.error(f"Failed to initialize Garmin client: {e}")
+    if client is None:
+        write_json(AUTH_FAILED_RESULT)
+        return 1
+    
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            start_date = request['start']
+            end_date = request['end']
+        except (ValueError, KeyError, TypeError):
+            write_json(INVALID_REQUEST_RESULT)
+            continue
+        
+        write_json(asyncio.run(sync_wellness_by_date_range(start_date, end_date, client)))
+    
+    return 0
+
+
+DEFAULT_SOCKET_PATH = '/tmp/garmin-sync.sock'
+
+
+def remove_stale_socket(path: str) -> None:
+    """
+    Remove a socket file left behind by a dead daemon; refuse to take over a
+    live one, or to delete anything that is not a socket (e.g. a mistyped
+    --socket=PATH naming a regular file).
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise RuntimeError(f'{path} exists and is not a socket')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+    raise RuntimeError(f'Another daemon is already listening on {path}')
+
+
+async def serve_socket(path: str = DEFAULT_SOCKET_PATH) -> int:
+    """
+    Run as a daemon serving sync requests on a Unix socket.
+    
+    Each connection sends one JSON line, {"cmd": "sync_wellness", "start":
+    "YYYY-MM-DD", "end": "YYYY-MM-DD"} ("cmd" may be omitted), and receives
+    one JSON result line before the connection is closed. The client, its
+    HTTP connections and the request budget stay warm between requests.
+    
+    Returns:
+        Process exit code
+    """
+    try:
+        client = create_client()
+    except Exception as e:
+        client = None
+        logger.error(f"Failed to initialize Garmin client: {e}")
+    if client is None:
+        write_json(AUTH_FAILED_RESULT)
+        return 1
+    
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            line = await reader.readline()
+            try:
+                request = json.loads(line)
+                if request.get('cmd', 'sync_wellness') != 'sync_wellness':
+                    raise ValueError(f"Unknown command: {request['cmd']}")
+                start_date = request['start']
+                end_date = request['end']
+            except (ValueError, KeyError, TypeError, AttributeError):
+                result = INVALID_REQUEST_RESULT
+            else:
+                result = await sync_wellness_by_date_range(start_date, end_date, client)
+            writer.write(encode_json(result))
+            await writer.drain()
+        except ConnectionError as e:
+            logger.warning(f"Client disconnected: {e}")
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+    
+    try:
+        remove_stale_socket(path)
+    except RuntimeError as e:
+        write_json({'success': False, 'error': 'SOCKET_UNAVAILABLE', 'message': str(e)})
+        return 1
+    
+    # Wellness data is personal; only the owning user may connect. The umask
+    # applies at bind time, so the socket never exists with wider permissions
+    old_umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(handle, path=path)
+    finally:
+        os.umask(old_umask)
+    try:
+        logger.info(f"Listening on {path}")
+        async with server:
+            await server.serve_forever()
+    finally:
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+    return 0
+
+
 if __name__ == '__main__':
-    if len(sys.argv) != 3:
-        print(json.dumps({
+    if sys.argv[1:] == ['--server']:
+        sys.exit(serve())
+    
+    if len(sys.argv) == 2 and (sys.argv[1] == '--socket' or sys.argv[1].startswith('--socket=')):
+        socket_path = sys.argv[1].partition('=')[2] or DEFAULT_SOCKET_PATH
+        try:
+            sys.exit(asyncio.run(serve_socket(socket_path)))
+        except KeyboardInterrupt:
+            sys.exit(0)
+    
+    stream = '--stream' in sys.argv[1:]
+    if stream:
+        sys.argv.remove('--stream')
+    
+    if len(sys.argv) != 3 or any(arg.startswith('--') for arg in sys.argv[1:]):
+        write_json({
             'success': False,
             'error': 'INVALID_ARGS',
-            'message': 'Usage: sync-garmin-wellness-mcp.py <start_date> <end_date>'
-        }))
+            'message': 'Usage: sync-garmin-wellness-mcp.py (<start_date> <end_date> [--stream] | --server | --socket[=PATH])'
+        })
         sys.exit(1)
     
     start_date = sys.argv[1]
     end_date = sys.argv[2]
     
-    result = sync_wellness_by_date_range(start_date, end_date)
-    print(json.dumps(result))
+    if stream:
+        # Entries go out as they complete; the result itself only carries the summary
+        result = asyncio.run(sync_wellness_by_date_range(start_date, end_date, on_entry=write_json))
+        result.pop('wellness_data', None)
+        write_json({'done': True, **result})
+    else:
+        result = asyncio.run(sync_wellness_by_date_range(start_date, end_date))
+        write_json(result)
     
     sys.exit(0 if result['success'] else 1)
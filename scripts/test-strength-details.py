@@ -5,6 +5,16 @@ import logging
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # optional speedup (garmin-connect-mcp "speedups" extra)
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional, streams the metric descriptors out of the dump
+    ijson = None
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stderr)
 logger = logging.getLogger(__name__)
@@ -20,6 +30,38 @@ from garmin_connect_mcp.client import (
 )
 from garmin_connect_mcp.auth import load_config
 
+def dump_json(obj, path):
+    # Activity details can run to megabytes; orjson writes them in one go
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # e.g. integers wider than 64 bits
+            pass
+        else:
+            with open(path, 'wb') as f:
+                f.write(data)
+            return
+    with open(path, 'w') as f:
+        json.dump(obj, f, indent=2)
+
+def download_details(garmin, activity_id, path):
+    # Stream the response body straight to disk: no parse, no re-dump, and
+    # only one chunk of a possibly huge payload in memory at a time
+    url = f"{garmin.garmin_connect_activity}/{activity_id}/details"
+    params = {'maxChartSize': '2000', 'maxPolylineSize': '4000'}  # get_activity_details defaults
+    response = garmin.garth.get('connectapi', url, params=params, api=True, stream=True)
+    with response, open(path, 'wb') as f:
+        for chunk in response.iter_content(chunk_size=1 << 20):
+            f.write(chunk)
+
+def print_metric_descriptors(path):
+    with open(path, 'rb') as f:
+        if ijson is not None:
+            keys = [d.get('key') for d in ijson.items(f, 'metricDescriptors.item')]
+        else:
+            keys = [d.get('key') for d in json.load(f).get('metricDescriptors') or []]
+    print(f"{len(keys)} metric descriptors: {', '.join(map(str, keys))}")
+
 def test_details(activity_id):
     env_path = project_root / '.env.local'
     load_dotenv(env_path)
@@ -33,15 +75,16 @@ def test_details(activity_id):
     
     print(f"Fetching get_activity for {activity_id}...")
     act = client.safe_call('get_activity', activity_id)
-    with open('debug_act.json', 'w') as f:
-        json.dump(act, f, indent=2)
+    dump_json(act, 'debug_act.json')
         
     print(f"Fetching get_activity_details for {activity_id}...")
     try:
-        details = client.safe_call('get_activity_details', activity_id)
-        with open('debug_details.json', 'w') as f:
-            json.dump(details, f, indent=2)
+        if hasattr(garmin, 'garth') and hasattr(garmin, 'garmin_connect_activity'):
+            download_details(garmin, activity_id, 'debug_details.json')
+        else:
+            dump_json(client.safe_call('get_activity_details', activity_id), 'debug_details.json')
         print("Details saved to debug_details.json")
+        print_metric_descriptors('debug_details.json')
     except Exception as e:
         print(f"get_activity_details failed: {e}")
 